@@ -0,0 +1,17 @@
+# Generated by Django 5.2.9 on 2026-10-16 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('campaigns', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='mediaplan',
+            index=models.Index(condition=models.Q(('status', 'pending_review')), fields=['-created_at'], name='ix_media_plan_pending_review'),
+        ),
+    ]
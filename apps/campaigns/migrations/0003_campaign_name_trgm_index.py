@@ -0,0 +1,19 @@
+# Generated by Django 5.2.9 on 2026-10-16 14:05
+
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('campaigns', '0002_mediaplan_pending_review_index'),
+        ('core', '0002_pg_trgm_extension'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='campaign',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['campaign_name'], name='ix_campaign_name_trgm', opclasses=['gin_trgm_ops']),
+        ),
+    ]
@@ -13,6 +13,7 @@ V100 Changes:
 """
 from django.db import models
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
 from django.utils.translation import gettext_lazy as _
 from apps.core.models import BaseModel
 
@@ -156,6 +157,14 @@ class MediaPlan(BaseModel):
         verbose_name = _('media plan')
         verbose_name_plural = _('media plans')
         ordering = ['-created_at']
+        indexes = [
+            # Client portal dashboard: plans awaiting client review, newest first
+            models.Index(
+                fields=['-created_at'],
+                condition=models.Q(status='pending_review'),
+                name='ix_media_plan_pending_review'
+            ),
+        ]
 
     def __str__(self):
         return f"{self.name}"
@@ -221,6 +230,11 @@ class Campaign(BaseModel):
             models.Index(fields=['category']),
             models.Index(fields=['product']),
             models.Index(fields=['language']),
+            GinIndex(
+                fields=['campaign_name'],
+                name='ix_campaign_name_trgm',
+                opclasses=['gin_trgm_ops']
+            ),
         ]
 
     def __str__(self):
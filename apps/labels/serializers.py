@@ -247,6 +247,26 @@ class BulkLabelAssignmentSerializer(serializers.Serializer):
         min_length=1
     )
 
+    def validate_label_values(self, value):
+        """Check all label values exist with a single IN query."""
+        existing_ids = set(
+            LabelValue.objects.filter(id__in=value).values_list('id', flat=True)
+        )
+        missing = [str(value_id) for value_id in dict.fromkeys(value) if value_id not in existing_ids]
+        if missing:
+            raise serializers.ValidationError(
+                f"Label values not found: {', '.join(missing)}"
+            )
+        return value
+
+
+class BulkLabelRemovalSerializer(serializers.Serializer):
+    """Serializer for bulk label removal."""
+    label_values = serializers.ListField(
+        child=serializers.UUIDField(),
+        min_length=1
+    )
+
 
 class LabelStatisticsSerializer(serializers.Serializer):
     """Serializer for label statistics response."""
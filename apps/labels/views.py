@@ -19,7 +19,8 @@ from .serializers import (
     LabelLevelSerializer, LabelValueSerializer, LabelValueNestedSerializer,
     CampaignLabelSerializer, MediaPlanLabelSerializer,
     SubcampaignLabelSerializer, ProjectLabelSerializer,
-    BulkLabelAssignmentSerializer, LabelStatisticsSerializer
+    BulkLabelAssignmentSerializer, BulkLabelRemovalSerializer,
+    LabelStatisticsSerializer
 )
 
 
@@ -227,29 +228,45 @@ class CampaignLabelViewSet(viewsets.ModelViewSet):
         serializer.is_valid(raise_exception=True)
 
         label_value_ids = serializer.validated_data['label_values']
-        created = []
 
-        for value_id in label_value_ids:
-            obj, was_created = CampaignLabel.objects.get_or_create(
+        existing_ids = set(
+            CampaignLabel.objects.filter(
+                campaign_id=campaign_id,
+                label_value_id__in=label_value_ids
+            ).values_list('label_value_id', flat=True)
+        )
+        new_labels = [
+            CampaignLabel(
                 campaign_id=campaign_id,
                 label_value_id=value_id,
-                defaults={'assigned_by': request.user}
+                assigned_by=request.user
             )
-            if was_created:
-                created.append(obj)
-
+            for value_id in dict.fromkeys(label_value_ids)
+            if value_id not in existing_ids
+        ]
+        # UUID pks are assigned client-side; rows lost to a concurrent insert
+        # are skipped by the conflict clause and drop out of the re-fetch below
+        CampaignLabel.objects.bulk_create(new_labels, ignore_conflicts=True)
+
+        created = self.queryset.filter(pk__in=[obj.pk for obj in new_labels])
         result_serializer = CampaignLabelSerializer(created, many=True)
         return Response(result_serializer.data, status=status.HTTP_201_CREATED)
 
     @action(detail=False, methods=['delete'], url_path='bulk-remove/(?P<campaign_id>[^/.]+)')
     def bulk_remove(self, request, campaign_id=None):
         """Bulk remove labels from a campaign."""
-        label_value_ids = request.data.get('label_values', [])
+        serializer = BulkLabelRemovalSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        label_value_ids = serializer.validated_data['label_values']
 
-        deleted, _ = CampaignLabel.objects.filter(
+        queryset = CampaignLabel.objects.filter(
             campaign_id=campaign_id,
             label_value_id__in=label_value_ids
-        ).delete()
+        )
+        # Campaign labels have no delete signals and nothing references them,
+        # so skip the collector and issue a single DELETE statement
+        deleted = queryset._raw_delete(queryset.db) or 0
 
         return Response({'deleted': deleted})
 
@@ -0,0 +1,73 @@
+"""
+Portal Filters - Declared filtersets for client portal endpoints
+
+Declaring the FilterSet classes up front avoids DjangoFilterBackend
+building a new class from `filterset_fields` on every request.
+"""
+import django_filters
+from django.db.models import Q
+from rest_framework import filters
+from apps.campaigns.models import Campaign, MediaPlan
+from .models import ClientPortalSettings, PortalMessage, PortalActivityLog
+
+
+class PortalCampaignFilter(django_filters.FilterSet):
+    """Filter for campaigns in portal view."""
+
+    class Meta:
+        model = Campaign
+        fields = ['media_plan', 'is_active']
+
+
+class PortalMediaPlanFilter(django_filters.FilterSet):
+    """Filter for media plans in portal view."""
+
+    class Meta:
+        model = MediaPlan
+        fields = ['status', 'project']
+
+
+class PortalMessageFilter(django_filters.FilterSet):
+    """Filter for PortalMessage model."""
+
+    class Meta:
+        model = PortalMessage
+        fields = ['is_read', 'campaign']
+
+
+class PortalActivityLogFilter(django_filters.FilterSet):
+    """Filter for PortalActivityLog model."""
+
+    class Meta:
+        model = PortalActivityLog
+        fields = ['action', 'user', 'client']
+
+
+class ClientPortalSettingsFilter(django_filters.FilterSet):
+    """Filter for ClientPortalSettings model."""
+
+    class Meta:
+        model = ClientPortalSettings
+        fields = ['client', 'is_active']
+
+
+class TrigramSearchFilter(filters.SearchFilter):
+    """
+    Search filter matching terms by trigram word similarity.
+
+    Unlike SearchFilter's ILIKE '%term%', the similarity operator can use
+    a pg_trgm GIN index on each of the view's search_fields.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        search_fields = self.get_search_fields(view, request)
+        search_terms = self.get_search_terms(request)
+        if not search_fields or not search_terms:
+            return queryset
+
+        for term in search_terms:
+            conditions = Q()
+            for field in search_fields:
+                conditions |= Q(**{f'{field}__trigram_word_similar': term})
+            queryset = queryset.filter(conditions)
+        return queryset
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.9 on 2026-10-16 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portal', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='portalmessage',
+            index=models.Index(fields=['client', '-created_at'], name='portal_port_client__315750_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='portalmessage',
+            index=models.Index(condition=models.Q(('is_read', False)), fields=['client', 'is_read'], name='ix_portal_message_unread'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.9 on 2026-10-16 10:05
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portal', '0002_portalmessage_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='portalmessage',
+            name='has_attachments',
+        ),
+    ]
@@ -93,13 +93,20 @@ class PortalMessage(BaseModel):
     )
     read_at = models.DateTimeField(_('read at'), null=True, blank=True)
 
-    # Attachments handled separately
-    has_attachments = models.BooleanField(_('has attachments'), default=False)
+    # Attachments handled separately; `has_attachments` is annotated at query time
 
     class Meta:
         verbose_name = _('portal message')
         verbose_name_plural = _('portal messages')
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['client', '-created_at']),
+            models.Index(
+                fields=['client', 'is_read'],
+                condition=models.Q(is_read=False),
+                name='ix_portal_message_unread'
+            ),
+        ]
 
     def __str__(self):
         return f"{self.subject} - {self.client.name}"
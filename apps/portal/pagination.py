@@ -0,0 +1,15 @@
+"""
+Portal Pagination - Cursor-based paging for client portal lists
+"""
+from rest_framework.pagination import CursorPagination
+
+
+class PortalCursorPagination(CursorPagination):
+    """
+    Cursor pagination keyed on creation time.
+
+    Each page is an index range scan from the previous cursor instead of an
+    OFFSET scan, so deep pages cost the same as the first one.
+    """
+    page_size = 50
+    ordering = '-created_at'
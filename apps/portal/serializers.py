@@ -2,16 +2,59 @@
 Portal Serializers - Client Portal API
 """
 from rest_framework import serializers
+from django.core.cache import cache
 from .models import (
     ClientPortalSettings, PortalMessage, PortalMessageAttachment, PortalActivityLog
 )
 from apps.campaigns.models import Campaign, MediaPlan, Project
 from apps.campaigns.serializers import CampaignListSerializer, MediaPlanListSerializer
 
+# Storage URLs are cached for this long (keep it below any signed-URL expiry)
+FILE_URL_CACHE_TIMEOUT = 3600
+
+
+def get_cached_file_url(file):
+    """
+    Get the storage URL for a file, cached by storage name.
+
+    Cloud storages sign (and may HEAD) on every `.url` access, which
+    dominates list responses; the key changes whenever the file is replaced.
+    """
+    if not file:
+        return None
+    key = f'portal:file_url:{file.name}'
+    url = cache.get(key)
+    if url is None:
+        url = file.url
+        cache.set(key, url, FILE_URL_CACHE_TIMEOUT)
+    return url
+
+
+class CachedFileURLMixin:
+    """Represent a file/image field using the cached storage URL."""
+
+    def to_representation(self, value):
+        if not value:
+            return None
+        url = get_cached_file_url(value)
+        request = self.context.get('request')
+        if request is not None:
+            return request.build_absolute_uri(url)
+        return url
+
+
+class CachedFileField(CachedFileURLMixin, serializers.FileField):
+    pass
+
+
+class CachedImageField(CachedFileURLMixin, serializers.ImageField):
+    pass
+
 
 class ClientPortalSettingsSerializer(serializers.ModelSerializer):
     """Serializer for ClientPortalSettings model."""
     client_name = serializers.CharField(source='client.name', read_only=True)
+    custom_logo = CachedImageField(required=False, allow_null=True)
 
     class Meta:
         model = ClientPortalSettings
@@ -31,6 +74,7 @@ class ClientPortalSettingsSerializer(serializers.ModelSerializer):
 
 class PortalMessageAttachmentSerializer(serializers.ModelSerializer):
     """Serializer for PortalMessageAttachment model."""
+    file = CachedFileField()
     file_url = serializers.SerializerMethodField()
 
     class Meta:
@@ -39,12 +83,12 @@ class PortalMessageAttachmentSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'file_size', 'mime_type']
 
     def get_file_url(self, obj):
-        if obj.file:
+        url = get_cached_file_url(obj.file)
+        if url:
             request = self.context.get('request')
             if request:
-                return request.build_absolute_uri(obj.file.url)
-            return obj.file.url
-        return None
+                return request.build_absolute_uri(url)
+        return url
 
 
 class PortalMessageSerializer(serializers.ModelSerializer):
@@ -52,6 +96,7 @@ class PortalMessageSerializer(serializers.ModelSerializer):
     sender_name = serializers.CharField(source='sender.full_name', read_only=True, allow_null=True)
     sender_email = serializers.CharField(source='sender.email', read_only=True, allow_null=True)
     campaign_name = serializers.CharField(source='campaign.name', read_only=True, allow_null=True)
+    has_attachments = serializers.BooleanField(read_only=True)
     attachments = PortalMessageAttachmentSerializer(many=True, read_only=True)
 
     class Meta:
@@ -68,12 +113,16 @@ class PortalMessageSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         validated_data['sender'] = self.context['request'].user
-        return super().create(validated_data)
+        message = super().create(validated_data)
+        # Querysets annotate has_attachments; a new message has none yet
+        message.has_attachments = False
+        return message
 
 
 class PortalMessageListSerializer(serializers.ModelSerializer):
     """Lightweight serializer for PortalMessage list."""
     sender_name = serializers.CharField(source='sender.full_name', read_only=True, allow_null=True)
+    has_attachments = serializers.BooleanField(read_only=True)
 
     class Meta:
         model = PortalMessage
@@ -99,6 +148,21 @@ class PortalActivityLogSerializer(serializers.ModelSerializer):
         read_only_fields = fields
 
 
+class PortalActivityLogListSerializer(serializers.ModelSerializer):
+    """Lightweight serializer for PortalActivityLog list."""
+    user_email = serializers.CharField(source='user.email', read_only=True)
+    user_name = serializers.CharField(source='user.full_name', read_only=True)
+
+    class Meta:
+        model = PortalActivityLog
+        fields = [
+            'id', 'user', 'user_email', 'user_name', 'client',
+            'action', 'entity_type', 'entity_id', 'entity_name',
+            'created_at'
+        ]
+        read_only_fields = fields
+
+
 # =============================================================================
 # PORTAL-SPECIFIC DATA SERIALIZERS
 # =============================================================================
@@ -115,55 +179,57 @@ class PortalDashboardSerializer(serializers.Serializer):
 
 class PortalCampaignSerializer(serializers.ModelSerializer):
     """Serializer for campaigns in portal view."""
-    project_name = serializers.CharField(source='project.name', read_only=True)
-    advertiser_name = serializers.CharField(source='project.advertiser.name', read_only=True)
-    media_plans_count = serializers.SerializerMethodField()
+    media_plan_name = serializers.CharField(source='media_plan.name', read_only=True)
+    project_name = serializers.CharField(source='media_plan.project.name', read_only=True)
+    advertiser_name = serializers.CharField(
+        source='media_plan.project.advertiser.name', read_only=True
+    )
+    subcampaigns_count = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = Campaign
         fields = [
-            'id', 'name', 'code', 'status', 'objective',
-            'project_name', 'advertiser_name',
+            'id', 'campaign_name', 'is_active',
+            'media_plan', 'media_plan_name', 'project_name', 'advertiser_name',
             'start_date', 'end_date',
-            'media_plans_count',
+            'total_budget_micros',
+            'subcampaigns_count',
             'created_at'
         ]
 
-    def get_media_plans_count(self, obj):
-        return obj.media_plans.count()
-
 
 class PortalMediaPlanSerializer(serializers.ModelSerializer):
     """Serializer for media plans in portal view."""
-    campaign_name = serializers.CharField(source='campaign.name', read_only=True)
-    subcampaigns_summary = serializers.SerializerMethodField()
+    project_name = serializers.CharField(source='project.name', read_only=True)
+    advertiser_name = serializers.CharField(source='project.advertiser.name', read_only=True)
+    campaigns_count = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = MediaPlan
         fields = [
-            'id', 'name', 'version', 'status',
-            'campaign_name',
+            'id', 'name', 'status',
+            'project_name', 'advertiser_name',
             'start_date', 'end_date',
             'total_budget_micros',
-            'subcampaigns_summary',
+            'campaigns_count',
             'created_at'
         ]
 
-    def get_subcampaigns_summary(self, obj):
-        """Get summary of subcampaigns by channel."""
-        summary = {}
-        for sc in obj.subcampaigns.all():
-            if sc.channel not in summary:
-                summary[sc.channel] = {
-                    'count': 0,
-                    'budget_micros': 0
-                }
-            summary[sc.channel]['count'] += 1
-            summary[sc.channel]['budget_micros'] += sc.budget_micros
-        return summary
-
 
 class PortalApprovalSerializer(serializers.Serializer):
     """Serializer for approval action in portal."""
     is_approved = serializers.BooleanField()
     comment = serializers.CharField(required=False, allow_blank=True)
+
+
+class PortalMessageOperationSerializer(serializers.Serializer):
+    """Serializer for a single operation in a message batch."""
+    OPERATION_CHOICES = ['mark_read', 'delete']
+
+    type = serializers.ChoiceField(choices=OPERATION_CHOICES)
+    id = serializers.UUIDField()
+
+
+class PortalMessageBatchSerializer(serializers.Serializer):
+    """Serializer for batched message operations in portal."""
+    ops = PortalMessageOperationSerializer(many=True, allow_empty=False)
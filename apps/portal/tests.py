@@ -0,0 +1,39 @@
+"""
+Portal Tests - Client portal endpoints
+"""
+from django.contrib.auth import get_user_model
+from django_tenants.test.cases import TenantTestCase
+from django_tenants.test.client import TenantClient
+
+
+class PortalEndpointTests(TenantTestCase):
+    """Every portal list endpoint resolves its querysets and serializers."""
+
+    @classmethod
+    def setup_tenant(cls, tenant):
+        tenant.name = 'Portal Test'
+        tenant.code_prefix = 'PT'
+        return tenant
+
+    def setUp(self):
+        super().setUp()
+        self.user = get_user_model().objects.create_superuser(
+            email='portal-admin@example.com',
+            password='test-password',
+            first_name='Portal',
+            last_name='Admin'
+        )
+        self.client = TenantClient(self.tenant)
+        self.client.force_login(self.user)
+
+    def test_dashboard(self):
+        response = self.client.get('/api/v1/portal/dashboard/')
+        self.assertEqual(response.status_code, 200)
+
+    def test_campaign_list(self):
+        response = self.client.get('/api/v1/portal/campaigns/')
+        self.assertEqual(response.status_code, 200)
+
+    def test_media_plan_list(self):
+        response = self.client.get('/api/v1/portal/media-plans/')
+        self.assertEqual(response.status_code, 200)
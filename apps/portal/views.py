@@ -8,8 +8,11 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.views import APIView
 from django_filters.rest_framework import DjangoFilterBackend
 from django.utils import timezone
-from django.db.models import Q
+from django.db.models import (
+    Q, Count, Exists, OuterRef, Window
+)
 
+from apps.core.models import Advertiser
 from apps.core.permissions import IsClientPortalUser
 from apps.campaigns.models import Campaign, MediaPlan, Project
 from apps.accounts.models import ClientMembership
@@ -21,9 +24,20 @@ from .serializers import (
     ClientPortalSettingsSerializer,
     PortalMessageSerializer, PortalMessageListSerializer,
     PortalMessageAttachmentSerializer, PortalActivityLogSerializer,
+    PortalActivityLogListSerializer,
     PortalDashboardSerializer, PortalCampaignSerializer, PortalMediaPlanSerializer,
-    PortalApprovalSerializer
+    PortalApprovalSerializer, PortalMessageBatchSerializer
+)
+from .filters import (
+    PortalCampaignFilter, PortalMediaPlanFilter, PortalMessageFilter,
+    PortalActivityLogFilter, ClientPortalSettingsFilter, TrigramSearchFilter
 )
+from .pagination import PortalCursorPagination
+
+# Dashboard display caps - the UI shows at most this many pending plans,
+# and the unread badge saturates at this value ("99+").
+DASHBOARD_PENDING_PLANS_LIMIT = 20
+DASHBOARD_UNREAD_MESSAGES_LIMIT = 100
 
 
 class PortalPermissionMixin:
@@ -50,8 +64,8 @@ class PortalDashboardView(APIView, PortalPermissionMixin):
         client_ids = self.get_client_ids()
 
         # Get settings
-        settings_obj = None
         welcome_message = "Welcome to the Client Portal"
+        unread_messages = 0
 
         if client_ids:
             settings_obj = ClientPortalSettings.objects.filter(
@@ -60,32 +74,46 @@ class PortalDashboardView(APIView, PortalPermissionMixin):
             if settings_obj:
                 welcome_message = settings_obj.welcome_message or welcome_message
 
-        # Get campaigns
-        campaigns_query = Campaign.objects.select_related('project', 'project__advertiser')
+            # Badge count saturates at the display cap, so count at most that
+            # many rows instead of every unread message
+            unread_messages = PortalMessage.objects.filter(
+                client_id__in=client_ids,
+                is_read=False
+            ).values('id')[:DASHBOARD_UNREAD_MESSAGES_LIMIT].count()
+
+        # Get recent campaigns with the active-campaign total carried on each
+        # row as a window count, so both come from a single query
+        campaigns_query = Campaign.objects.select_related(
+            'media_plan', 'media_plan__project', 'media_plan__project__advertiser'
+        )
         if client_ids:
             campaigns_query = campaigns_query.filter(
-                project__advertiser__client_id__in=client_ids
+                media_plan__project__advertiser__client_id__in=client_ids
             )
-
-        active_campaigns = campaigns_query.filter(status='active').count()
-        recent_campaigns = campaigns_query.order_by('-created_at')[:5]
-
-        # Get pending media plans for approval
-        pending_plans = MediaPlan.objects.filter(
-            status='pending_client_review'
+        recent_campaigns = list(
+            campaigns_query.annotate(
+                subcampaigns_count=Count('subcampaigns'),
+                active_total=Window(expression=Count('pk', filter=Q(is_active=True)))
+            ).order_by('-created_at')[:5]
+        )
+        active_campaigns = recent_campaigns[0].active_total if recent_campaigns else 0
+
+        # Get pending media plans for approval (capped to the display limit,
+        # evaluated once and reused for both the count and the list)
+        pending_plans = MediaPlan.objects.select_related(
+            'project', 'project__advertiser'
+        ).filter(
+            status='pending_review'
         )
         if client_ids:
             pending_plans = pending_plans.filter(
-                campaign__project__advertiser__client_id__in=client_ids
+                project__advertiser__client_id__in=client_ids
             )
-
-        # Get unread messages
-        unread_messages = 0
-        if client_ids:
-            unread_messages = PortalMessage.objects.filter(
-                client_id__in=client_ids,
-                is_read=False
-            ).count()
+        pending_plans = list(
+            pending_plans.annotate(
+                campaigns_count=Count('campaigns')
+            ).order_by('-created_at')[:DASHBOARD_PENDING_PLANS_LIMIT]
+        )
 
         # Log activity
         if client_ids:
@@ -99,7 +127,7 @@ class PortalDashboardView(APIView, PortalPermissionMixin):
         data = {
             'welcome_message': welcome_message,
             'active_campaigns': active_campaigns,
-            'pending_approvals': pending_plans.count(),
+            'pending_approvals': len(pending_plans),
             'recent_campaigns': PortalCampaignSerializer(recent_campaigns, many=True).data,
             'pending_media_plans': PortalMediaPlanSerializer(pending_plans, many=True).data,
             'unread_messages': unread_messages
@@ -119,25 +147,28 @@ class PortalCampaignViewSet(viewsets.ReadOnlyModelViewSet, PortalPermissionMixin
     Portal Campaigns - Campaign listing for client portal.
     """
     queryset = Campaign.objects.select_related(
-        'project', 'project__advertiser', 'project__advertiser__client'
-    ).all()
+        'media_plan', 'media_plan__project', 'media_plan__project__advertiser'
+    ).annotate(subcampaigns_count=Count('subcampaigns')).all()
     serializer_class = PortalCampaignSerializer
     permission_classes = [IsAuthenticated]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
-    search_fields = ['name', 'code']
-    ordering_fields = ['name', 'start_date', 'created_at']
+    pagination_class = PortalCursorPagination
+    filter_backends = [DjangoFilterBackend, TrigramSearchFilter, filters.OrderingFilter]
+    search_fields = ['campaign_name']
+    ordering_fields = ['campaign_name', 'start_date', 'created_at']
     ordering = ['-created_at']
-    filterset_fields = ['status', 'objective']
+    filterset_class = PortalCampaignFilter
 
     def get_queryset(self):
         queryset = super().get_queryset()
         client_ids = self.get_client_ids()
         if client_ids:
-            queryset = queryset.filter(
-                project__advertiser__client_id__in=client_ids
-            )
-        # Only show relevant statuses to clients
-        return queryset.exclude(status__in=['draft', 'cancelled'])
+            # Semi-join on the owning advertiser so rows are never multiplied
+            queryset = queryset.filter(Exists(Advertiser.objects.filter(
+                id=OuterRef('media_plan__project__advertiser_id'),
+                client_id__in=client_ids
+            )))
+        # Only show campaigns of media plans in client-relevant statuses
+        return queryset.exclude(media_plan__status__in=['draft', 'cancelled'])
 
 
 class PortalMediaPlanViewSet(viewsets.ReadOnlyModelViewSet, PortalPermissionMixin):
@@ -145,24 +176,26 @@ class PortalMediaPlanViewSet(viewsets.ReadOnlyModelViewSet, PortalPermissionMixi
     Portal Media Plans - Media plan listing for client portal.
     """
     queryset = MediaPlan.objects.select_related(
-        'campaign', 'campaign__project', 'campaign__project__advertiser'
-    ).prefetch_related('subcampaigns').all()
+        'project', 'project__advertiser'
+    ).annotate(campaigns_count=Count('campaigns')).all()
     serializer_class = PortalMediaPlanSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = PortalCursorPagination
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
     ordering = ['-created_at']
-    filterset_fields = ['status', 'campaign']
+    filterset_class = PortalMediaPlanFilter
 
     def get_queryset(self):
         queryset = super().get_queryset()
         client_ids = self.get_client_ids()
         if client_ids:
-            queryset = queryset.filter(
-                campaign__project__advertiser__client_id__in=client_ids
-            )
+            queryset = queryset.filter(Exists(Advertiser.objects.filter(
+                id=OuterRef('project__advertiser_id'),
+                client_id__in=client_ids
+            )))
         # Only show client-relevant statuses
         return queryset.filter(
-            status__in=['pending_client_review', 'client_approved', 'active', 'completed']
+            status__in=['pending_review', 'approved', 'active', 'completed']
         )
 
     @action(detail=True, methods=['post'])
@@ -170,7 +203,7 @@ class PortalMediaPlanViewSet(viewsets.ReadOnlyModelViewSet, PortalPermissionMixi
         """Approve or reject a media plan."""
         media_plan = self.get_object()
 
-        if media_plan.status != 'pending_client_review':
+        if media_plan.status != 'pending_review':
             return Response(
                 {'error': 'Media plan is not pending review'},
                 status=status.HTTP_400_BAD_REQUEST
@@ -183,14 +216,12 @@ class PortalMediaPlanViewSet(viewsets.ReadOnlyModelViewSet, PortalPermissionMixi
         comment = serializer.validated_data.get('comment', '')
 
         if is_approved:
-            media_plan.status = 'client_approved'
-            media_plan.client_approved_by = request.user
-            media_plan.client_approved_at = timezone.now()
+            media_plan.status = 'approved'
         else:
-            media_plan.status = 'internal_approved'  # Send back for revision
+            media_plan.status = 'draft'  # Send back for revision
             # TODO: Create rejection comment/notification
 
-        media_plan.save()
+        media_plan.save(update_fields=['status', 'updated_at'])
 
         # Log activity
         client_ids = self.get_client_ids()
@@ -220,9 +251,10 @@ class PortalMessageViewSet(viewsets.ModelViewSet, PortalPermissionMixin):
         'sender', 'campaign'
     ).prefetch_related('attachments').all()
     permission_classes = [IsAuthenticated]
+    pagination_class = PortalCursorPagination
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
     ordering = ['-created_at']
-    filterset_fields = ['is_read', 'campaign']
+    filterset_class = PortalMessageFilter
 
     def get_serializer_class(self):
         if self.action == 'list':
@@ -230,7 +262,11 @@ class PortalMessageViewSet(viewsets.ModelViewSet, PortalPermissionMixin):
         return PortalMessageSerializer
 
     def get_queryset(self):
-        queryset = super().get_queryset()
+        queryset = super().get_queryset().annotate(
+            has_attachments=Exists(
+                PortalMessageAttachment.objects.filter(message=OuterRef('pk'))
+            )
+        )
         client_ids = self.get_client_ids()
         if client_ids:
             queryset = queryset.filter(client_id__in=client_ids)
@@ -275,6 +311,45 @@ class PortalMessageViewSet(viewsets.ModelViewSet, PortalPermissionMixin):
             )
         return Response({'success': True})
 
+    @action(detail=False, methods=['post'])
+    def batch(self, request):
+        """Apply several message operations with one statement per type."""
+        serializer = PortalMessageBatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        ops = serializer.validated_data['ops']
+        mark_ids = [op['id'] for op in ops if op['type'] == 'mark_read']
+        delete_ids = [op['id'] for op in ops if op['type'] == 'delete']
+
+        marked_read = 0
+        deleted = 0
+        client_ids = self.get_client_ids()
+        # None means no client restriction (superuser); an empty list means
+        # the user has no client access at all
+        if client_ids is None:
+            messages = PortalMessage.objects.all()
+        else:
+            messages = PortalMessage.objects.filter(client_id__in=client_ids)
+
+        if client_ids is None or client_ids:
+            if mark_ids:
+                now = timezone.now()
+                marked_read = messages.filter(
+                    pk__in=mark_ids,
+                    is_read=False
+                ).update(
+                    is_read=True,
+                    read_by=request.user,
+                    read_at=now,
+                    updated_at=now
+                )
+            if delete_ids:
+                # Count messages only, not their cascaded attachments
+                _total, deleted_by_model = messages.filter(pk__in=delete_ids).delete()
+                deleted = deleted_by_model.get(PortalMessage._meta.label, 0)
+
+        return Response({'marked_read': marked_read, 'deleted': deleted})
+
 
 class PortalActivityLogViewSet(viewsets.ReadOnlyModelViewSet, PortalPermissionMixin):
     """
@@ -283,14 +358,28 @@ class PortalActivityLogViewSet(viewsets.ReadOnlyModelViewSet, PortalPermissionMi
     queryset = PortalActivityLog.objects.select_related('user', 'client').all()
     serializer_class = PortalActivityLogSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = PortalCursorPagination
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
     ordering = ['-created_at']
-    filterset_fields = ['action', 'user', 'client']
+    filterset_class = PortalActivityLogFilter
+
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return PortalActivityLogListSerializer
+        return PortalActivityLogSerializer
 
     def get_queryset(self):
         queryset = super().get_queryset()
         user = self.request.user
 
+        if self.action == 'list':
+            # List rows skip the user_agent/metadata columns and the client join
+            queryset = queryset.select_related(None).select_related('user').only(
+                'id', 'user', 'client', 'action',
+                'entity_type', 'entity_id', 'entity_name', 'created_at',
+                'user__email', 'user__first_name', 'user__last_name'
+            )
+
         # Regular users can only see their own activity
         if not user.is_staff:
             queryset = queryset.filter(user=user)
@@ -310,7 +399,7 @@ class ClientPortalSettingsViewSet(viewsets.ModelViewSet, PortalPermissionMixin):
     serializer_class = ClientPortalSettingsSerializer
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend]
-    filterset_fields = ['client', 'is_active']
+    filterset_class = ClientPortalSettingsFilter
 
     def get_queryset(self):
         queryset = super().get_queryset()
@@ -2,23 +2,27 @@
 Workflows Admin - Workflow Administration
 """
 from django.contrib import admin
+from django.db.models import Count, Q
+from django.utils import timezone
 from .models import (
     WorkflowDefinition, WorkflowState, WorkflowTransition,
     WorkflowInstance, WorkflowHistory,
     ApprovalRequest, ApprovalResponse, WorkflowNotification
 )
+from .services import invalidate_unread_summary
 
 
 class WorkflowStateInline(admin.TabularInline):
     model = WorkflowState
-    extra = 1
+    extra = 0
     ordering = ['display_order']
 
 
 class WorkflowTransitionInline(admin.TabularInline):
     model = WorkflowTransition
-    extra = 1
+    extra = 0
     fk_name = 'workflow'
+    raw_id_fields = ['from_state', 'to_state']
 
 
 @admin.register(WorkflowDefinition)
@@ -41,58 +45,134 @@ class WorkflowDefinitionAdmin(admin.ModelAdmin):
 @admin.register(WorkflowState)
 class WorkflowStateAdmin(admin.ModelAdmin):
     list_display = ['name', 'code', 'workflow', 'state_type', 'display_order', 'is_editable']
+    list_select_related = ['workflow']
     list_filter = ['workflow', 'state_type', 'is_editable', 'requires_approval']
     search_fields = ['name', 'code']
+    raw_id_fields = ['workflow']
     ordering = ['workflow', 'display_order']
 
 
 @admin.register(WorkflowTransition)
 class WorkflowTransitionAdmin(admin.ModelAdmin):
     list_display = ['name', 'workflow', 'from_state', 'to_state', 'requires_approval']
+    list_select_related = ['workflow', 'from_state__workflow', 'to_state__workflow']
     list_filter = ['workflow', 'requires_approval', 'auto_execute']
     search_fields = ['name', 'code']
-    filter_horizontal = ['allowed_groups']
+    raw_id_fields = ['workflow', 'from_state', 'to_state']
+    autocomplete_fields = ['allowed_groups']
 
 
 @admin.register(WorkflowInstance)
 class WorkflowInstanceAdmin(admin.ModelAdmin):
     list_display = ['workflow', 'current_state', 'content_type', 'object_id', 'is_active', 'started_at']
+    list_select_related = ['workflow', 'current_state__workflow', 'content_type']
     list_filter = ['workflow', 'current_state', 'is_active', 'content_type']
+    raw_id_fields = ['workflow', 'current_state']
     readonly_fields = ['content_type', 'object_id', 'started_at', 'completed_at']
 
 
 @admin.register(WorkflowHistory)
 class WorkflowHistoryAdmin(admin.ModelAdmin):
     list_display = ['instance', 'from_state', 'to_state', 'performed_by', 'performed_at']
-    list_filter = ['instance__workflow', 'performed_at']
+    list_select_related = [
+        'instance__workflow', 'instance__current_state',
+        'from_state__workflow', 'to_state__workflow', 'performed_by'
+    ]
+    list_filter = ['instance__workflow']
+    date_hierarchy = 'performed_at'
     readonly_fields = ['instance', 'transition', 'from_state', 'to_state', 'performed_by', 'performed_at']
 
+    def get_queryset(self, request):
+        # Text/JSON columns are not listed; skip them for changelist rows
+        return super().get_queryset(request).defer('metadata', 'comment')
+
 
 class ApprovalResponseInline(admin.TabularInline):
     model = ApprovalResponse
     extra = 0
+    max_num = 0  # View-only; responses are edited in ApprovalResponseAdmin
+    can_delete = False
     readonly_fields = ['user', 'is_approved', 'comment', 'responded_at']
 
 
 @admin.register(ApprovalRequest)
 class ApprovalRequestAdmin(admin.ModelAdmin):
-    list_display = ['workflow_instance', 'transition', 'status', 'requested_by', 'requested_at', 'due_date']
-    list_filter = ['status', 'requested_at']
+    list_display = [
+        'workflow_instance', 'transition', 'status', 'requested_by', 'requested_at', 'due_date',
+        'approval_count', 'rejection_count'
+    ]
+    list_select_related = [
+        'workflow_instance__workflow', 'workflow_instance__current_state',
+        'transition__from_state', 'transition__to_state', 'requested_by'
+    ]
+    list_filter = ['status']
+    date_hierarchy = 'requested_at'
     search_fields = ['workflow_instance__workflow__name']
+    raw_id_fields = ['workflow_instance', 'transition', 'requested_by', 'responded_by']
     readonly_fields = ['requested_at', 'responded_at']
-    filter_horizontal = ['required_approvers', 'required_groups']
+    autocomplete_fields = ['required_approvers', 'required_groups']
     inlines = [ApprovalResponseInline]
+    actions = ['cancel_pending']
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(
+            _approval_count=Count('responses', filter=Q(responses__is_approved=True)),
+            _rejection_count=Count('responses', filter=Q(responses__is_approved=False)),
+        ).defer('response_comment')
+
+    @admin.display(description='Approvals', ordering='_approval_count')
+    def approval_count(self, obj):
+        return obj._approval_count
+
+    @admin.display(description='Rejections', ordering='_rejection_count')
+    def rejection_count(self, obj):
+        return obj._rejection_count
+
+    @admin.action(description='Cancel selected pending requests', permissions=['change'])
+    def cancel_pending(self, request, queryset):
+        # Same audit fields as services.cancel_approval_request
+        now = timezone.now()
+        count = queryset.filter(status='pending').update(
+            status='cancelled',
+            responded_by=request.user,
+            responded_at=now,
+            updated_at=now
+        )
+        self.message_user(request, f'{count} approval request(s) cancelled.')
 
 
 @admin.register(ApprovalResponse)
 class ApprovalResponseAdmin(admin.ModelAdmin):
     list_display = ['approval_request', 'user', 'is_approved', 'responded_at']
-    list_filter = ['is_approved', 'responded_at']
+    list_select_related = [
+        'approval_request__workflow_instance__workflow',
+        'approval_request__workflow_instance__current_state',
+        'user'
+    ]
+    list_filter = ['is_approved']
+    date_hierarchy = 'responded_at'
+    raw_id_fields = ['approval_request', 'user']
     readonly_fields = ['responded_at']
 
 
 @admin.register(WorkflowNotification)
 class WorkflowNotificationAdmin(admin.ModelAdmin):
     list_display = ['title', 'user', 'notification_type', 'is_read', 'created_at']
+    list_select_related = ['user']
     list_filter = ['notification_type', 'is_read', 'email_sent']
+    date_hierarchy = 'created_at'
     search_fields = ['title', 'message', 'user__email']
+    raw_id_fields = ['user', 'workflow_instance', 'approval_request']
+    actions = ['mark_read']
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).defer('message', 'link')
+
+    @admin.action(description='Mark selected as read', permissions=['change'])
+    def mark_read(self, request, queryset):
+        unread = queryset.filter(is_read=False)
+        user_ids = set(unread.values_list('user_id', flat=True))
+        now = timezone.now()
+        count = unread.update(is_read=True, read_at=now, updated_at=now)
+        invalidate_unread_summary(*user_ids)
+        self.message_user(request, f'{count} notification(s) marked read.')
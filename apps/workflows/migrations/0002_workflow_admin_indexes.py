@@ -0,0 +1,49 @@
+# Generated by Django 5.2.9 on 2026-10-16 14:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('workflows', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='workflownotification',
+            name='workflows_w_user_id_e2bb40_idx',
+        ),
+        migrations.AddIndex(
+            model_name='approvalrequest',
+            index=models.Index(fields=['status', '-created_at'], name='workflows_a_status_5efa23_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='approvalrequest',
+            index=models.Index(fields=['due_date', 'status'], name='workflows_a_due_dat_98ba0c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='approvalresponse',
+            index=models.Index(fields=['approval_request', 'is_approved'], name='workflows_a_approva_c21a82_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='workflowhistory',
+            index=models.Index(fields=['instance', '-performed_at'], name='workflows_w_instanc_a4fe5a_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='workflowinstance',
+            index=models.Index(fields=['workflow', 'current_state', 'is_active'], name='workflows_w_workflo_f28d70_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='workflowinstance',
+            index=models.Index(fields=['is_active', '-created_at'], name='workflows_w_is_acti_5f6b7e_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='workflownotification',
+            index=models.Index(fields=['user', 'is_read', '-created_at'], name='workflows_w_user_id_f2865d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='workflownotification',
+            index=models.Index(fields=['notification_type', 'is_read'], name='workflows_w_notific_efa253_idx'),
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.9 on 2026-10-16 15:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+ENTITY_TYPE_MODELS = {
+    'campaign': ('campaigns', 'campaign'),
+    'media_plan': ('campaigns', 'mediaplan'),
+    'subcampaign': ('campaigns', 'subcampaign'),
+    'project': ('campaigns', 'project'),
+}
+
+
+def populate_entity_content_type(apps, schema_editor):
+    ContentType = apps.get_model('contenttypes', 'ContentType')
+    WorkflowDefinition = apps.get_model('workflows', 'WorkflowDefinition')
+    db_alias = schema_editor.connection.alias
+
+    for entity_type, (app_label, model) in ENTITY_TYPE_MODELS.items():
+        content_type, _ = ContentType.objects.using(db_alias).get_or_create(
+            app_label=app_label,
+            model=model
+        )
+        WorkflowDefinition.objects.using(db_alias).filter(
+            entity_type=entity_type
+        ).update(entity_content_type=content_type)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('workflows', '0002_workflow_admin_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='workflowdefinition',
+            name='entity_content_type',
+            field=models.ForeignKey(editable=False, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='contenttypes.contenttype', verbose_name='entity content type'),
+        ),
+        migrations.RunPython(populate_entity_content_type, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='workflowdefinition',
+            index=models.Index(fields=['tenant', 'entity_content_type', 'is_default'], name='workflows_w_tenant__c13109_idx'),
+        ),
+    ]
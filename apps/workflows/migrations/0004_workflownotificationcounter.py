@@ -0,0 +1,79 @@
+# Generated by Django 5.2.9 on 2026-10-16 16:10
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+COUNTER_FUNCTION_SQL = """
+CREATE OR REPLACE FUNCTION workflows_notification_unread_counter() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') AND NOT OLD.is_read THEN
+        EXECUTE format(
+            'UPDATE %I.workflows_workflownotificationcounter '
+            'SET unread = unread - 1 WHERE user_id = $1',
+            TG_TABLE_SCHEMA
+        ) USING OLD.user_id;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') AND NOT NEW.is_read THEN
+        EXECUTE format(
+            'INSERT INTO %I.workflows_workflownotificationcounter AS c (user_id, unread) '
+            'VALUES ($1, 1) ON CONFLICT (user_id) DO UPDATE SET unread = c.unread + 1',
+            TG_TABLE_SCHEMA
+        ) USING NEW.user_id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER workflows_notification_unread_insert
+    AFTER INSERT ON workflows_workflownotification
+    FOR EACH ROW EXECUTE FUNCTION workflows_notification_unread_counter();
+
+CREATE TRIGGER workflows_notification_unread_update
+    AFTER UPDATE OF is_read, user_id ON workflows_workflownotification
+    FOR EACH ROW
+    WHEN (OLD.is_read IS DISTINCT FROM NEW.is_read OR OLD.user_id IS DISTINCT FROM NEW.user_id)
+    EXECUTE FUNCTION workflows_notification_unread_counter();
+
+CREATE TRIGGER workflows_notification_unread_delete
+    AFTER DELETE ON workflows_workflownotification
+    FOR EACH ROW EXECUTE FUNCTION workflows_notification_unread_counter();
+"""
+
+DROP_COUNTER_FUNCTION_SQL = """
+DROP TRIGGER IF EXISTS workflows_notification_unread_insert ON workflows_workflownotification;
+DROP TRIGGER IF EXISTS workflows_notification_unread_update ON workflows_workflownotification;
+DROP TRIGGER IF EXISTS workflows_notification_unread_delete ON workflows_workflownotification;
+DROP FUNCTION IF EXISTS workflows_notification_unread_counter();
+"""
+
+BACKFILL_SQL = """
+INSERT INTO workflows_workflownotificationcounter (user_id, unread)
+SELECT user_id, COUNT(*) FROM workflows_workflownotification
+WHERE is_read = false
+GROUP BY user_id;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('workflows', '0003_workflowdefinition_entity_content_type'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WorkflowNotificationCounter',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='+', serialize=False, to=settings.AUTH_USER_MODEL, verbose_name='user')),
+                ('unread', models.IntegerField(default=0, verbose_name='unread')),
+            ],
+            options={
+                'verbose_name': 'workflow notification counter',
+                'verbose_name_plural': 'workflow notification counters',
+            },
+        ),
+        migrations.RunSQL(COUNTER_FUNCTION_SQL, DROP_COUNTER_FUNCTION_SQL),
+        migrations.RunSQL(BACKFILL_SQL, migrations.RunSQL.noop),
+    ]
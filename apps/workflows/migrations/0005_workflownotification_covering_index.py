@@ -0,0 +1,24 @@
+# Generated by Django 5.2.9 on 2026-10-16 16:40
+
+from django.contrib.postgres.operations import AddIndexConcurrently, RemoveIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('workflows', '0004_workflownotificationcounter'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='workflownotification',
+            index=models.Index(fields=['user', 'is_read', '-created_at'], include=['title', 'notification_type'], name='ix_wfnotification_user_unread'),
+        ),
+        RemoveIndexConcurrently(
+            model_name='workflownotification',
+            name='workflows_w_user_id_f2865d_idx',
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.9 on 2026-10-16 17:05
+
+from django.contrib.postgres.operations import AddIndexConcurrently, RemoveIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('workflows', '0005_workflownotification_covering_index'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='workflowinstance',
+            index=models.Index(fields=['workflow', 'current_state', 'is_active', '-created_at'], include=['content_type', 'object_id'], name='ix_wfinstance_lookup'),
+        ),
+        RemoveIndexConcurrently(
+            model_name='workflowinstance',
+            name='workflows_w_workflo_f28d70_idx',
+        ),
+    ]
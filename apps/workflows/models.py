@@ -4,12 +4,13 @@ Workflows Models - State Machine and Approval System
 This module provides workflow management using django-river for state machines
 and custom approval tracking.
 """
-from django.db import models
+from django.db import connection, models
 from django.conf import settings
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
 from django.utils.translation import gettext_lazy as _
 from apps.core.models import BaseModel
+from .utils import get_user_group_ids
 import uuid
 
 
@@ -24,6 +25,14 @@ class WorkflowDefinition(BaseModel):
         ('project', _('Project')),
     ]
 
+    # Model each entity type applies to, as (app_label, model)
+    ENTITY_TYPE_MODELS = {
+        'campaign': ('campaigns', 'campaign'),
+        'media_plan': ('campaigns', 'mediaplan'),
+        'subcampaign': ('campaigns', 'subcampaign'),
+        'project': ('campaigns', 'project'),
+    }
+
     tenant = models.ForeignKey(
         'core.Tenant',
         on_delete=models.CASCADE,
@@ -40,6 +49,15 @@ class WorkflowDefinition(BaseModel):
         max_length=20,
         choices=ENTITY_TYPE_CHOICES
     )
+    # Kept in sync with entity_type on save; used for workflow lookups
+    entity_content_type = models.ForeignKey(
+        ContentType,
+        on_delete=models.PROTECT,
+        related_name='+',
+        verbose_name=_('entity content type'),
+        null=True,
+        editable=False
+    )
 
     is_active = models.BooleanField(_('is active'), default=True)
     is_default = models.BooleanField(_('is default'), default=False)
@@ -49,10 +67,19 @@ class WorkflowDefinition(BaseModel):
         verbose_name_plural = _('workflow definitions')
         ordering = ['entity_type', 'name']
         unique_together = [['tenant', 'code']]
+        indexes = [
+            models.Index(fields=['tenant', 'entity_content_type', 'is_default']),
+        ]
 
     def __str__(self):
         return f"{self.name} ({self.entity_type})"
 
+    def save(self, *args, **kwargs):
+        self.entity_content_type = ContentType.objects.get_by_natural_key(
+            *self.ENTITY_TYPE_MODELS[self.entity_type]
+        )
+        super().save(*args, **kwargs)
+
 
 class WorkflowState(BaseModel):
     """
@@ -198,6 +225,12 @@ class WorkflowInstance(BaseModel):
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['content_type', 'object_id']),
+            models.Index(
+                fields=['workflow', 'current_state', 'is_active', '-created_at'],
+                include=['content_type', 'object_id'],
+                name='ix_wfinstance_lookup'
+            ),
+            models.Index(fields=['is_active', '-created_at']),
         ]
 
     def __str__(self):
@@ -205,18 +238,47 @@ class WorkflowInstance(BaseModel):
 
     def get_available_transitions(self, user=None):
         """Get transitions available from current state."""
+        if 'transitions' in getattr(self.workflow, '_prefetched_objects_cache', {}):
+            # Transitions were prefetched (see transitions_prefetch), so
+            # resolve state and group access in memory instead of querying
+            if user and not user.is_superuser:
+                user_group_ids = get_user_group_ids(user)
+            else:
+                user_group_ids = None
+            return [
+                transition for transition in self.workflow.transitions.all()
+                if transition.from_state_id == self.current_state_id and (
+                    user_group_ids is None or
+                    not transition.allowed_groups.all() or
+                    any(group.id in user_group_ids for group in transition.allowed_groups.all())
+                )
+            ]
+
         transitions = self.workflow.transitions.filter(from_state=self.current_state)
 
         if user and not user.is_superuser:
-            # Filter by user's groups
-            user_groups = user.groups.all()
+            # Filter by user's groups; EXISTS avoids the join fan-out that
+            # would otherwise need DISTINCT
+            allowed_groups = WorkflowTransition.allowed_groups.through.objects.filter(
+                workflowtransition_id=models.OuterRef('pk')
+            )
             transitions = transitions.filter(
-                models.Q(allowed_groups__isnull=True) |
-                models.Q(allowed_groups__in=user_groups)
-            ).distinct()
+                ~models.Exists(allowed_groups) |
+                models.Exists(allowed_groups.filter(group_id__in=get_user_group_ids(user)))
+            )
 
         return transitions
 
+    @classmethod
+    def transitions_prefetch(cls):
+        """Prefetch for workflow transitions used by get_available_transitions."""
+        return models.Prefetch(
+            'workflow__transitions',
+            queryset=WorkflowTransition.objects.select_related(
+                'from_state', 'to_state'
+            ).prefetch_related('allowed_groups')
+        )
+
 
 class WorkflowHistory(BaseModel):
     """
@@ -267,6 +329,9 @@ class WorkflowHistory(BaseModel):
         verbose_name = _('workflow history')
         verbose_name_plural = _('workflow histories')
         ordering = ['-performed_at']
+        indexes = [
+            models.Index(fields=['instance', '-performed_at']),
+        ]
 
     def __str__(self):
         return f"{self.from_state.name} → {self.to_state.name} by {self.performed_by}"
@@ -354,16 +419,29 @@ class ApprovalRequest(BaseModel):
         verbose_name = _('approval request')
         verbose_name_plural = _('approval requests')
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', '-created_at']),
+            models.Index(fields=['due_date', 'status']),
+        ]
 
     def __str__(self):
         return f"Approval for {self.workflow_instance} - {self.status}"
 
     @property
     def approval_count(self):
+        # Prefer the count annotated by list querysets over a query per row
+        if hasattr(self, '_approval_count'):
+            return self._approval_count
+        if 'responses' in getattr(self, '_prefetched_objects_cache', {}):
+            return sum(1 for response in self.responses.all() if response.is_approved)
         return self.responses.filter(is_approved=True).count()
 
     @property
     def rejection_count(self):
+        if hasattr(self, '_rejection_count'):
+            return self._rejection_count
+        if 'responses' in getattr(self, '_prefetched_objects_cache', {}):
+            return sum(1 for response in self.responses.all() if not response.is_approved)
         return self.responses.filter(is_approved=False).count()
 
     @property
@@ -397,6 +475,9 @@ class ApprovalResponse(BaseModel):
         verbose_name_plural = _('approval responses')
         unique_together = [['approval_request', 'user']]
         ordering = ['-responded_at']
+        indexes = [
+            models.Index(fields=['approval_request', 'is_approved']),
+        ]
 
     def __str__(self):
         action = 'approved' if self.is_approved else 'rejected'
@@ -469,8 +550,65 @@ class WorkflowNotification(BaseModel):
         verbose_name_plural = _('workflow notifications')
         ordering = ['-created_at']
         indexes = [
-            models.Index(fields=['user', 'is_read']),
+            models.Index(
+                fields=['user', 'is_read', '-created_at'],
+                include=['title', 'notification_type'],
+                name='ix_wfnotification_user_unread'
+            ),
+            models.Index(fields=['notification_type', 'is_read']),
         ]
 
     def __str__(self):
         return f"{self.title} - {self.user}"
+
+    @classmethod
+    def unread_summary(cls, user_id):
+        """
+        Count a user's unread notifications by type.
+
+        Hand-written SQL for the notification polling endpoint; served as an
+        index-only scan by ix_wfnotification_user_unread.
+
+        Returns:
+            dict mapping notification_type to unread count
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT notification_type, COUNT(*) FROM {} '
+                'WHERE user_id = %s AND is_read = false '
+                'GROUP BY notification_type'.format(
+                    connection.ops.quote_name(cls._meta.db_table)
+                ),
+                [user_id]
+            )
+            return dict(cursor.fetchall())
+
+
+class WorkflowNotificationCounter(models.Model):
+    """
+    Workflow Notification Counter - Unread notification count per user.
+
+    Maintained by database triggers on WorkflowNotification (see migration
+    0004), so reading it is a primary-key lookup instead of a COUNT(*).
+    Lives in the tenant schema alongside the notifications it counts.
+    """
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='+',
+        verbose_name=_('user')
+    )
+    unread = models.IntegerField(_('unread'), default=0)
+
+    class Meta:
+        verbose_name = _('workflow notification counter')
+        verbose_name_plural = _('workflow notification counters')
+
+    def __str__(self):
+        return f"{self.user_id}: {self.unread}"
+
+    @classmethod
+    def get_unread(cls, user_id):
+        """Get a user's unread notification count."""
+        return cls.objects.filter(user_id=user_id).values_list('unread', flat=True).first() or 0
@@ -100,7 +100,8 @@ class WorkflowInstanceSerializer(serializers.ModelSerializer):
     current_state_name = serializers.CharField(source='current_state.name', read_only=True)
     current_state_color = serializers.CharField(source='current_state.color', read_only=True)
     available_transitions = serializers.SerializerMethodField()
-    history = WorkflowHistorySerializer(many=True, read_only=True)
+    # Most recent rows only, prefetched by the view; full history has its own endpoint
+    history = WorkflowHistorySerializer(source='recent_history', many=True, read_only=True)
 
     class Meta:
         model = WorkflowInstance
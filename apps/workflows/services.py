@@ -1,14 +1,25 @@
 """
 Workflows Services - Business logic for workflow operations
 """
+import hashlib
+import time
+
 from django.utils import timezone
 from django.contrib.contenttypes.models import ContentType
-from django.db import transaction
+from django.core.cache import cache
+from django.db import connection, models, transaction
 
 from .models import (
     WorkflowDefinition, WorkflowState, WorkflowInstance,
     WorkflowHistory, ApprovalRequest, WorkflowNotification
 )
+from .utils import get_user_group_ids
+
+
+# Unread notification summaries are cached per user and invalidated on change
+UNREAD_SUMMARY_CACHE_TIMEOUT = 300
+# Rendered workflow definition lists; invalidated by bumping a version stamp
+DEFINITIONS_LIST_CACHE_TIMEOUT = 3600
 
 
 class WorkflowError(Exception):
@@ -41,16 +52,15 @@ def get_or_create_workflow_instance(entity, workflow_definition=None):
 
     # Get workflow definition if not provided
     if not workflow_definition:
-        entity_type = content_type.model
         workflow_definition = WorkflowDefinition.objects.filter(
-            entity_type=entity_type,
+            entity_content_type=content_type,
             is_active=True,
             is_default=True
         ).first()
 
         if not workflow_definition:
             raise WorkflowError(
-                f'No default workflow found for entity type: {entity_type}'
+                f'No default workflow found for entity type: {content_type.model}'
             )
 
     # Get initial state
@@ -78,7 +88,8 @@ def get_available_transitions(workflow_instance, user=None):
         user: Optional user to filter by permissions
 
     Returns:
-        QuerySet of WorkflowTransition
+        QuerySet of WorkflowTransition, or a list when the workflow's
+        transitions are prefetched
     """
     return workflow_instance.get_available_transitions(user)
 
@@ -102,8 +113,7 @@ def can_transition(workflow_instance, transition, user=None):
     # Check user permission
     if user and not user.is_superuser:
         if transition.allowed_groups.exists():
-            user_groups = user.groups.all()
-            if not transition.allowed_groups.filter(id__in=user_groups).exists():
+            if not transition.allowed_groups.filter(id__in=get_user_group_ids(user)).exists():
                 return False, 'User does not have permission for this transition'
 
     # Check if approval is required and pending
@@ -214,7 +224,8 @@ def request_approval(workflow_instance, transition, user, approvers=None, groups
     if existing:
         return existing
 
-    # Create approval request
+    # Create approval request; the post_save handler notifies approvers on
+    # commit, after they are assigned below
     approval_request = ApprovalRequest.objects.create(
         workflow_instance=workflow_instance,
         transition=transition,
@@ -250,16 +261,66 @@ def get_pending_approvals(user):
 
     Returns approvals where user is in required_approvers or required_groups.
     """
-    user_groups = user.groups.all()
-
     return ApprovalRequest.objects.filter(
         status='pending'
     ).filter(
         models.Q(required_approvers=user) |
-        models.Q(required_groups__in=user_groups)
+        models.Q(required_groups__user=user)
     ).distinct()
 
 
+def _definitions_version_key():
+    return f'wfdef:{connection.schema_name}:version'
+
+
+def definitions_list_cache_key(query_string):
+    """
+    Cache key for a rendered workflow definition list.
+
+    Args:
+        query_string: Request query string (filters, search, ordering, page)
+
+    Returns:
+        Cache key scoped to the current tenant schema and definitions version
+    """
+    version = cache.get_or_set(_definitions_version_key(), time.time_ns, None)
+    digest = hashlib.md5(query_string.encode()).hexdigest()
+    return f'wfdef:{connection.schema_name}:{version}:{digest}'
+
+
+def invalidate_definitions_list():
+    """Orphan every cached definition list for the current tenant schema."""
+    cache.set(_definitions_version_key(), time.time_ns(), None)
+
+
+def unread_summary_cache_key(user_id):
+    """Cache key for a user's unread summary in the current tenant schema."""
+    return f'wf:unread:{connection.schema_name}:{user_id}'
+
+
+def get_unread_summary(user):
+    """
+    Get a user's unread notification counts by type.
+
+    Args:
+        user: User
+
+    Returns:
+        dict mapping notification_type to unread count
+    """
+    key = unread_summary_cache_key(user.pk)
+    summary = cache.get(key)
+    if summary is None:
+        summary = WorkflowNotification.unread_summary(user.pk)
+        cache.set(key, summary, UNREAD_SUMMARY_CACHE_TIMEOUT)
+    return summary
+
+
+def invalidate_unread_summary(*user_ids):
+    """Drop cached unread summaries for the given users."""
+    cache.delete_many([unread_summary_cache_key(user_id) for user_id in user_ids])
+
+
 def get_user_notifications(user, unread_only=False):
     """Get notifications for a user."""
     queryset = WorkflowNotification.objects.filter(user=user)
@@ -272,16 +333,29 @@ def mark_notification_read(notification):
     """Mark a notification as read."""
     notification.is_read = True
     notification.read_at = timezone.now()
-    notification.save()
+    notification.save(update_fields=['is_read', 'read_at', 'updated_at'])
     return notification
 
 
 def mark_all_notifications_read(user):
-    """Mark all notifications for a user as read."""
-    WorkflowNotification.objects.filter(
+    """
+    Mark all notifications for a user as read in a single UPDATE.
+
+    Args:
+        user: User whose notifications to mark
+
+    Returns:
+        Number of notifications marked as read
+    """
+    now = timezone.now()
+    updated = WorkflowNotification.objects.filter(
         user=user,
         is_read=False
     ).update(
         is_read=True,
-        read_at=timezone.now()
+        read_at=now,
+        updated_at=now
     )
+    # Bulk update skips post_save, so invalidate here
+    invalidate_unread_summary(user.pk)
+    return updated
@@ -1,14 +1,19 @@
 """
 Workflows Signals - Handle workflow events
 """
-from django.db.models.signals import post_save
+from django.db import connection, transaction
+from django.contrib.auth.models import Group
+from django.db.models.signals import post_save, post_delete, pre_delete, m2m_changed
 from django.dispatch import receiver
 from django.utils import timezone
 
 from .models import (
+    WorkflowDefinition, WorkflowState, WorkflowTransition,
     WorkflowHistory, ApprovalRequest, ApprovalResponse,
     WorkflowNotification
 )
+from .services import execute_transition, invalidate_unread_summary, invalidate_definitions_list
+from .tasks import notify_approvers, send_workflow_notification
 
 
 @receiver(post_save, sender=WorkflowHistory)
@@ -36,16 +41,13 @@ def on_approval_request_created(sender, instance, created, **kwargs):
     if not created:
         return
 
-    # Notify required approvers
-    for user in instance.required_approvers.all():
-        WorkflowNotification.objects.create(
-            user=user,
-            notification_type='approval_required',
-            workflow_instance=instance.workflow_instance,
-            approval_request=instance,
-            title='Approval Required',
-            message=f'Your approval is required for a {instance.workflow_instance.workflow.entity_type}.',
-        )
+    # Approvers are assigned after the row is saved, so resolve them once the
+    # creating transaction commits
+    schema_name = connection.schema_name
+    approval_request_id = str(instance.pk)
+    transaction.on_commit(
+        lambda: notify_approvers.delay(approval_request_id, schema_name)
+    )
 
 
 @receiver(post_save, sender=ApprovalResponse)
@@ -67,7 +69,6 @@ def on_approval_response(sender, instance, created, **kwargs):
         workflow_instance = approval_request.workflow_instance
         transition = approval_request.transition
 
-        from .services import execute_transition
         execute_transition(
             workflow_instance,
             transition,
@@ -88,3 +89,57 @@ def on_approval_response(sender, instance, created, **kwargs):
             title=f'Approval {action}',
             message=f'{instance.user.full_name} has {action} your request.',
         )
+
+
+@receiver(post_save, sender=WorkflowNotification)
+def on_notification_created(sender, instance, created, **kwargs):
+    """Queue the notification email once the creating transaction commits."""
+    invalidate_unread_summary(instance.user_id)
+    if not created:
+        return
+
+    schema_name = connection.schema_name
+    transaction.on_commit(
+        lambda: send_workflow_notification.delay(str(instance.pk), schema_name)
+    )
+
+
+@receiver(post_delete, sender=WorkflowNotification)
+def on_notification_deleted(sender, instance, **kwargs):
+    """Keep the cached unread summary in step with deletions."""
+    invalidate_unread_summary(instance.user_id)
+
+
+@receiver(post_save, sender=WorkflowDefinition)
+@receiver(post_delete, sender=WorkflowDefinition)
+@receiver(post_save, sender=WorkflowState)
+@receiver(post_delete, sender=WorkflowState)
+def on_workflow_definition_changed(sender, instance, **kwargs):
+    """Drop cached definition lists when a definition or its states change."""
+    invalidate_definitions_list()
+
+
+@receiver(m2m_changed, sender=WorkflowTransition.allowed_groups.through)
+def on_transition_groups_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    """Touch transitions whose allowed groups change so list ETags move on."""
+    if reverse:
+        # instance is a Group; a clear needs the transitions before removal
+        if action in ('post_add', 'post_remove'):
+            transitions = WorkflowTransition.objects.filter(pk__in=pk_set)
+        elif action == 'pre_clear':
+            transitions = WorkflowTransition.objects.filter(allowed_groups=instance)
+        else:
+            return
+    elif action in ('post_add', 'post_remove', 'post_clear'):
+        transitions = WorkflowTransition.objects.filter(pk=instance.pk)
+    else:
+        return
+    transitions.update(updated_at=timezone.now())
+
+
+@receiver(pre_delete, sender=Group)
+def on_group_deleted(sender, instance, **kwargs):
+    """Deleting a group drops its allowed_groups rows without m2m_changed."""
+    WorkflowTransition.objects.filter(allowed_groups=instance).update(
+        updated_at=timezone.now()
+    )
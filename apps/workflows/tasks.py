@@ -0,0 +1,150 @@
+"""
+Workflows Tasks - Background jobs for workflow notifications and transitions
+"""
+from smtplib import SMTPException
+
+from celery import group, shared_task
+from django.contrib.auth import get_user_model
+from django.core.mail import send_mail
+from django.db import OperationalError, transaction
+from django.utils import timezone
+from django_tenants.utils import schema_context
+
+from .models import WorkflowInstance, WorkflowTransition, ApprovalRequest, WorkflowNotification
+from .services import execute_transition, invalidate_unread_summary, WorkflowError
+
+
+@shared_task(
+    ignore_result=True,
+    autoretry_for=(SMTPException,),
+    max_retries=3,
+    retry_backoff=True,
+    retry_jitter=True
+)
+def send_workflow_notification(notification_id, schema_name):
+    """
+    Email a workflow notification to its user.
+
+    Args:
+        notification_id: WorkflowNotification ID
+        schema_name: Tenant schema the notification lives in
+    """
+    with schema_context(schema_name):
+        notification = WorkflowNotification.objects.select_related('user').filter(
+            pk=notification_id,
+            email_sent=False
+        ).first()
+        if notification is None or not notification.user.email:
+            return
+
+        send_mail(
+            subject=notification.title,
+            message=notification.message,
+            from_email=None,
+            recipient_list=[notification.user.email],
+        )
+
+        # Flag delivery without a full-row save or post_save signals
+        WorkflowNotification.objects.filter(pk=notification_id).update(
+            email_sent=True,
+            email_sent_at=timezone.now()
+        )
+
+
+@shared_task(
+    bind=True,
+    name='workflows.execute_transition',
+    autoretry_for=(OperationalError,),
+    max_retries=3,
+    retry_backoff=True,
+    retry_jitter=True
+)
+def execute_transition_task(self, instance_id, transition_id, user_id, schema_name,
+                            comment='', metadata=None):
+    """
+    Execute a workflow transition outside the request cycle.
+
+    Safe to run more than once: with the instance row locked, a repeated
+    run finds the instance already moved on and the transition no longer
+    available from its current state.
+
+    Args:
+        instance_id: WorkflowInstance ID
+        transition_id: WorkflowTransition ID
+        user_id: ID of the user performing the transition
+        schema_name: Tenant schema the instance lives in
+        comment: Optional comment
+        metadata: Optional additional metadata
+
+    Returns:
+        WorkflowHistory ID, or None if the transition no longer applies
+    """
+    with schema_context(schema_name), transaction.atomic():
+        instance = WorkflowInstance.objects.select_related(
+            'workflow', 'current_state'
+        ).select_for_update(of=('self',)).get(pk=instance_id)
+        transition = WorkflowTransition.objects.select_related(
+            'from_state', 'to_state'
+        ).get(pk=transition_id, workflow_id=instance.workflow_id)
+        user = get_user_model().objects.get(pk=user_id)
+
+        try:
+            history = execute_transition(
+                instance, transition, user,
+                comment=comment, metadata=metadata
+            )
+        except WorkflowError:
+            return None
+        return str(history.pk)
+
+
+@shared_task(ignore_result=True)
+def notify_approvers(approval_request_id, schema_name):
+    """
+    Notify everyone who can respond to an approval request.
+
+    Creates the notifications for direct and group approvers in one INSERT,
+    then fans the emails out as a Celery group so they send in parallel
+    across workers.
+
+    Args:
+        approval_request_id: ApprovalRequest ID
+        schema_name: Tenant schema the request lives in
+    """
+    with schema_context(schema_name):
+        approval_request = ApprovalRequest.objects.select_related(
+            'workflow_instance__workflow'
+        ).filter(pk=approval_request_id, status='pending').first()
+        if approval_request is None:
+            return
+
+        user_ids = set(
+            approval_request.required_approvers.values_list('pk', flat=True)
+        ) | set(
+            get_user_model().objects.filter(
+                groups__in=approval_request.required_groups.all()
+            ).values_list('pk', flat=True)
+        )
+        if not user_ids:
+            return
+
+        workflow_instance = approval_request.workflow_instance
+        # bulk_create skips post_save, so cache invalidation and email
+        # delivery are handled below
+        notifications = WorkflowNotification.objects.bulk_create([
+            WorkflowNotification(
+                user_id=user_id,
+                notification_type='approval_required',
+                workflow_instance=workflow_instance,
+                approval_request=approval_request,
+                title='Approval Required',
+                message=f'Your approval is required for a {workflow_instance.workflow.entity_type}.',
+            )
+            for user_id in user_ids
+        ])
+        invalidate_unread_summary(*user_ids)
+
+    group(
+        send_workflow_notification.s(str(notification.pk), schema_name)
+        for notification in notifications
+    ).apply_async()
@@ -6,7 +6,8 @@ from rest_framework.routers import DefaultRouter
 
 from .views import (
     WorkflowDefinitionViewSet, WorkflowStateViewSet, WorkflowTransitionViewSet,
-    WorkflowInstanceViewSet, ApprovalRequestViewSet, WorkflowNotificationViewSet
+    WorkflowInstanceViewSet, ApprovalRequestViewSet, WorkflowNotificationViewSet,
+    WorkflowDashboardView
 )
 
 router = DefaultRouter()
@@ -18,5 +19,6 @@ router.register(r'approvals', ApprovalRequestViewSet, basename='approvalrequest'
 router.register(r'notifications', WorkflowNotificationViewSet, basename='workflownotification')
 
 urlpatterns = [
+    path('dashboard/', WorkflowDashboardView.as_view(), name='workflow-dashboard'),
     path('', include(router.urls)),
 ]
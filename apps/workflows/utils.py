@@ -0,0 +1,23 @@
+"""
+Workflows Utils - Shared helpers for workflow permission checks
+"""
+
+
+def get_user_group_ids(user):
+    """
+    Get the IDs of a user's groups, cached on the user object.
+
+    request.user lives for one request, so repeated permission checks while
+    rendering a list only query auth groups once.
+
+    Args:
+        user: User instance
+
+    Returns:
+        frozenset of Group IDs
+    """
+    group_ids = getattr(user, '_cached_group_ids', None)
+    if group_ids is None:
+        group_ids = frozenset(user.groups.values_list('id', flat=True))
+        user._cached_group_ids = group_ids
+    return group_ids
@@ -1,18 +1,33 @@
 """
 Workflows Views - Workflow API Endpoints
 """
+import hashlib
+import uuid
+
 from rest_framework import viewsets, status, filters
 from rest_framework.decorators import action
+from rest_framework.generics import get_object_or_404
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.renderers import JSONRenderer
 from rest_framework.views import APIView
 from django_filters.rest_framework import DjangoFilterBackend
+from django.core.cache import cache
+from django.contrib.auth.models import Group
+from django.db import IntegrityError, connection, models, transaction
+from django.http import HttpResponse, JsonResponse
 from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.dateparse import parse_datetime
+from django.utils.http import quote_etag
+
+from apps.accounts.models import User
 
 from .models import (
     WorkflowDefinition, WorkflowState, WorkflowTransition,
     WorkflowInstance, WorkflowHistory,
-    ApprovalRequest, ApprovalResponse, WorkflowNotification
+    ApprovalRequest, ApprovalResponse, WorkflowNotification,
+    WorkflowNotificationCounter
 )
 from .serializers import (
     WorkflowDefinitionSerializer, WorkflowDefinitionListSerializer,
@@ -25,8 +40,11 @@ from .serializers import (
 from .services import (
     get_or_create_workflow_instance, execute_transition,
     request_approval, can_transition, WorkflowError,
-    get_user_notifications, mark_notification_read, mark_all_notifications_read
+    get_user_notifications, mark_notification_read, mark_all_notifications_read,
+    get_unread_summary, get_pending_approvals,
+    definitions_list_cache_key, invalidate_definitions_list, DEFINITIONS_LIST_CACHE_TIMEOUT
 )
+from .tasks import execute_transition_task
 
 
 class WorkflowDefinitionViewSet(viewsets.ModelViewSet):
@@ -48,26 +66,76 @@ class WorkflowDefinitionViewSet(viewsets.ModelViewSet):
             return WorkflowDefinitionListSerializer
         return WorkflowDefinitionSerializer
 
+    def list(self, request, *args, **kwargs):
+        # Definitions change rarely; serve the rendered JSON body from cache
+        if request.accepted_renderer.format != 'json':
+            return super().list(request, *args, **kwargs)
+
+        key = definitions_list_cache_key(request.GET.urlencode())
+        content = cache.get(key)
+        if content is None:
+            response = super().list(request, *args, **kwargs)
+            content = JSONRenderer().render(response.data)
+            cache.set(key, content, DEFINITIONS_LIST_CACHE_TIMEOUT)
+        return HttpResponse(content, content_type='application/json')
+
     @action(detail=True, methods=['post'])
     def set_default(self, request, pk=None):
         """Set this workflow as default for its entity type."""
         workflow = self.get_object()
 
-        # Unset other defaults for same entity type and tenant
+        # Make this the only default for its entity type and tenant in a
+        # single UPDATE
+        now = timezone.now()
         WorkflowDefinition.objects.filter(
-            tenant=workflow.tenant,
-            entity_type=workflow.entity_type,
-            is_default=True
-        ).update(is_default=False)
+            models.Q(pk=workflow.pk) | models.Q(is_default=True),
+            tenant_id=workflow.tenant_id,
+            entity_content_type_id=workflow.entity_content_type_id
+        ).update(
+            is_default=models.Case(
+                models.When(pk=workflow.pk, then=models.Value(True)),
+                default=models.Value(False)
+            ),
+            updated_at=now
+        )
+        # Bulk update skips post_save, so invalidate here
+        invalidate_definitions_list()
 
         workflow.is_default = True
-        workflow.save()
+        workflow.updated_at = now
 
         serializer = self.get_serializer(workflow)
         return Response(serializer.data)
 
 
-class WorkflowStateViewSet(viewsets.ModelViewSet):
+class ListETagMixin:
+    """
+    Answer list requests with an ETag and 304 Not Modified when unchanged.
+
+    The tag covers the query string plus the newest updated_at and row count
+    of the filtered queryset, so edits, additions and deletions all change it.
+    Many-to-many changes reach the tag through updated_at (see the
+    allowed_groups handlers in signals).
+    """
+
+    def list(self, request, *args, **kwargs):
+        stats = self.filter_queryset(self.get_queryset()).aggregate(
+            last_modified=models.Max('updated_at'),
+            total=models.Count('pk')
+        )
+        etag = quote_etag(hashlib.md5(
+            f"{request.GET.urlencode()}:{stats['last_modified']}:{stats['total']}".encode()
+        ).hexdigest())
+
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = super().list(request, *args, **kwargs)
+            response['ETag'] = etag
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+
+class WorkflowStateViewSet(ListETagMixin, viewsets.ModelViewSet):
     """
     API endpoint for managing workflow states.
     """
@@ -80,7 +148,7 @@ class WorkflowStateViewSet(viewsets.ModelViewSet):
     filterset_fields = ['workflow', 'state_type']
 
 
-class WorkflowTransitionViewSet(viewsets.ModelViewSet):
+class WorkflowTransitionViewSet(ListETagMixin, viewsets.ModelViewSet):
     """
     API endpoint for managing workflow transitions.
     """
@@ -99,18 +167,45 @@ class WorkflowInstanceViewSet(viewsets.ReadOnlyModelViewSet):
     """
     queryset = WorkflowInstance.objects.select_related(
         'workflow', 'current_state'
-    ).prefetch_related('history').all()
+    ).all()
     serializer_class = WorkflowInstanceSerializer
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
     ordering = ['-created_at']
     filterset_fields = ['workflow', 'current_state', 'is_active', 'content_type']
 
+    # History rows embedded in serialized instances, and the default page
+    # size of the history action
+    RECENT_HISTORY_LIMIT = 20
+    # Upper bound on ?limit= for the history action
+    MAX_HISTORY_LIMIT = 100
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        # Only actions that serialize the instance render its history and
+        # available transitions
+        if self.action in ('list', 'retrieve'):
+            queryset = queryset.prefetch_related(
+                self.get_history_prefetch(),
+                WorkflowInstance.transitions_prefetch()
+            )
+        elif self.action == 'execute_transition':
+            # History is loaded after the transition is recorded
+            queryset = queryset.prefetch_related(WorkflowInstance.transitions_prefetch())
+        return queryset
+
+    def get_history_prefetch(self):
+        return models.Prefetch(
+            'history',
+            queryset=WorkflowHistory.objects.select_related(
+                'from_state', 'to_state', 'performed_by'
+            ).order_by('-performed_at')[:self.RECENT_HISTORY_LIMIT],
+            to_attr='recent_history'
+        )
+
     @action(detail=True, methods=['post'])
     def execute_transition(self, request, pk=None):
         """Execute a transition for this workflow instance."""
-        instance = self.get_object()
-
         serializer = ExecuteTransitionSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
@@ -119,11 +214,23 @@ class WorkflowInstanceViewSet(viewsets.ReadOnlyModelViewSet):
         metadata = serializer.validated_data.get('metadata', {})
 
         try:
-            transition = WorkflowTransition.objects.get(id=transition_id)
-            history = execute_transition(
-                instance, transition, request.user,
-                comment=comment, metadata=metadata
-            )
+            with transaction.atomic():
+                # Lock the instance row so concurrent transitions on the same
+                # instance run one after another against its current state
+                instance = get_object_or_404(
+                    self.get_queryset().select_for_update(of=('self',)), pk=pk
+                )
+                self.check_object_permissions(request, instance)
+
+                transition = WorkflowTransition.objects.select_related(
+                    'from_state', 'to_state'
+                ).get(id=transition_id, workflow_id=instance.workflow_id)
+                history = execute_transition(
+                    instance, transition, request.user,
+                    comment=comment, metadata=metadata
+                )
+
+            models.prefetch_related_objects([instance], self.get_history_prefetch())
             return Response({
                 'success': True,
                 'history': WorkflowHistorySerializer(history).data,
@@ -142,6 +249,59 @@ class WorkflowInstanceViewSet(viewsets.ReadOnlyModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
+    @action(detail=True, methods=['post'])
+    def execute_transition_async(self, request, pk=None):
+        """Queue a transition for this workflow instance; returns 202."""
+        instance = self.get_object()
+
+        serializer = ExecuteTransitionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        transition_id = serializer.validated_data['transition_id']
+
+        try:
+            transition = WorkflowTransition.objects.select_related(
+                'from_state', 'to_state'
+            ).get(id=transition_id, workflow_id=instance.workflow_id)
+        except WorkflowTransition.DoesNotExist:
+            return Response(
+                {'error': 'Transition not found'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        can_do, reason = can_transition(instance, transition, request.user)
+        if not can_do:
+            return Response({'error': reason}, status=status.HTTP_400_BAD_REQUEST)
+
+        # A client retrying with the same Idempotency-Key gets the task that
+        # was already queued instead of a second one
+        idempotency_key = request.headers.get('Idempotency-Key') or str(uuid.uuid4())
+        task_id = f'exec:{instance.id}:{transition.id}:{idempotency_key}'
+        idempotency_cache_key = f'wf:{connection.schema_name}:{task_id}'
+        if cache.add(idempotency_cache_key, True, 3600):
+            try:
+                execute_transition_task.apply_async(
+                    args=[
+                        str(instance.id), str(transition.id), str(request.user.pk),
+                        connection.schema_name,
+                        serializer.validated_data.get('comment', ''),
+                        serializer.validated_data.get('metadata', {})
+                    ],
+                    task_id=task_id
+                )
+            except Exception:
+                # Nothing was queued; release the key so the client can retry
+                cache.delete(idempotency_cache_key)
+                return Response(
+                    {'error': 'Could not queue the transition, please retry'},
+                    status=status.HTTP_503_SERVICE_UNAVAILABLE
+                )
+
+        return Response(
+            {'task_id': task_id, 'status': 'queued'},
+            status=status.HTTP_202_ACCEPTED
+        )
+
     @action(detail=True, methods=['post'])
     def request_approval(self, request, pk=None):
         """Request approval for a transition."""
@@ -155,9 +315,6 @@ class WorkflowInstanceViewSet(viewsets.ReadOnlyModelViewSet):
         try:
             transition = WorkflowTransition.objects.get(id=transition_id)
 
-            from apps.accounts.models import User
-            from django.contrib.auth.models import Group
-
             approvers = None
             groups = None
 
@@ -195,10 +352,52 @@ class WorkflowInstanceViewSet(viewsets.ReadOnlyModelViewSet):
 
     @action(detail=True, methods=['get'])
     def history(self, request, pk=None):
-        """Get full history for this workflow instance."""
+        """
+        Get history for this workflow instance, newest first.
+
+        Optional query params: ?since=<ISO datetime>, ?before=<ISO datetime>
+        and ?limit=<n> (default RECENT_HISTORY_LIMIT, at most
+        MAX_HISTORY_LIMIT). Page back through older rows with ?before= set
+        to the last performed_at received.
+        """
         instance = self.get_object()
-        history = instance.history.all()
-        serializer = WorkflowHistorySerializer(history, many=True)
+        history = WorkflowHistory.objects.filter(instance=instance).select_related(
+            'from_state', 'to_state', 'performed_by'
+        ).order_by('-performed_at')
+
+        for param, lookup in (('since', 'performed_at__gte'), ('before', 'performed_at__lt')):
+            value = request.query_params.get(param)
+            if not value:
+                continue
+            try:
+                value_dt = parse_datetime(value)
+            except ValueError:
+                value_dt = None
+            if value_dt is None:
+                return Response(
+                    {'error': f'{param} must be an ISO 8601 datetime'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            if timezone.is_naive(value_dt):
+                value_dt = timezone.make_aware(value_dt)
+            history = history.filter(**{lookup: value_dt})
+
+        limit = request.query_params.get('limit')
+        if limit:
+            try:
+                limit = int(limit)
+            except ValueError:
+                limit = 0
+            if limit < 1:
+                return Response(
+                    {'error': 'limit must be a positive integer'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            limit = min(limit, self.MAX_HISTORY_LIMIT)
+        else:
+            limit = self.RECENT_HISTORY_LIMIT
+
+        serializer = WorkflowHistorySerializer(history[:limit], many=True)
         return Response(serializer.data)
 
 
@@ -207,25 +406,39 @@ class ApprovalRequestViewSet(viewsets.ModelViewSet):
     API endpoint for managing approval requests.
     """
     queryset = ApprovalRequest.objects.select_related(
-        'workflow_instance', 'transition', 'requested_by', 'responded_by'
-    ).prefetch_related('responses', 'required_approvers', 'required_groups').all()
+        'workflow_instance__workflow', 'workflow_instance__current_state',
+        'transition', 'requested_by', 'responded_by'
+    ).all()
     serializer_class = ApprovalRequestSerializer
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
     ordering = ['-created_at']
     filterset_fields = ['workflow_instance', 'status', 'requested_by']
 
+    # Actions that serialize the queried objects; update re-serializes after
+    # DRF drops the prefetch cache, and destroy serializes nothing
+    SERIALIZED_ACTIONS = ('list', 'retrieve', 'pending', 'cancel')
+
+    def get_queryset(self):
+        """Prefetch responses and approvers only where they are serialized."""
+        queryset = super().get_queryset()
+        if self.action in self.SERIALIZED_ACTIONS:
+            queryset = queryset.prefetch_related(
+                'responses', 'required_approvers', 'required_groups'
+            )
+        return queryset
+
     @action(detail=False, methods=['get'])
     def pending(self, request):
         """Get pending approvals for current user."""
         user = request.user
-        user_groups = user.groups.all()
 
-        pending = self.queryset.filter(
+        # Resolve group membership in the same query via auth_user_groups
+        pending = self.get_queryset().filter(
             status='pending'
         ).filter(
             models.Q(required_approvers=user) |
-            models.Q(required_groups__in=user_groups)
+            models.Q(required_groups__user=user)
         ).distinct()
 
         serializer = self.get_serializer(pending, many=True)
@@ -234,57 +447,77 @@ class ApprovalRequestViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=['post'])
     def respond(self, request, pk=None):
         """Respond to an approval request (approve/reject)."""
-        approval_request = self.get_object()
-
-        if approval_request.status != 'pending':
-            return Response(
-                {'error': 'This approval request is no longer pending'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-
         serializer = ApproveRejectSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
-        # Check if user can respond
         user = request.user
-        user_groups = user.groups.all()
 
-        can_respond = (
-            approval_request.required_approvers.filter(id=user.id).exists() or
-            approval_request.required_groups.filter(id__in=user_groups).exists() or
-            user.is_superuser
-        )
-
-        if not can_respond:
-            return Response(
-                {'error': 'You are not authorized to respond to this request'},
-                status=status.HTTP_403_FORBIDDEN
+        with transaction.atomic():
+            # Lock the request so concurrent responses see a settled status,
+            # and resolve the user's approver rights in the same query
+            approval_request = get_object_or_404(
+                ApprovalRequest.objects.select_for_update(of=('self',)).annotate(
+                    is_approver=models.Exists(
+                        ApprovalRequest.required_approvers.through.objects.filter(
+                            approvalrequest_id=models.OuterRef('pk'),
+                            user_id=user.pk
+                        )
+                    ),
+                    is_group_approver=models.Exists(
+                        ApprovalRequest.required_groups.through.objects.filter(
+                            approvalrequest_id=models.OuterRef('pk'),
+                            group__user=user
+                        )
+                    )
+                ),
+                pk=pk
             )
+            self.check_object_permissions(request, approval_request)
 
-        # Check if already responded
-        if ApprovalResponse.objects.filter(
-            approval_request=approval_request, user=user
-        ).exists():
-            return Response(
-                {'error': 'You have already responded to this request'},
-                status=status.HTTP_400_BAD_REQUEST
+            if approval_request.status != 'pending':
+                return Response(
+                    {'error': 'This approval request is no longer pending'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+            can_respond = (
+                approval_request.is_approver or
+                approval_request.is_group_approver or
+                user.is_superuser
             )
 
-        # Create response
-        response = ApprovalResponse.objects.create(
-            approval_request=approval_request,
-            user=user,
-            is_approved=serializer.validated_data['is_approved'],
-            comment=serializer.validated_data.get('comment', '')
-        )
+            if not can_respond:
+                return Response(
+                    {'error': 'You are not authorized to respond to this request'},
+                    status=status.HTTP_403_FORBIDDEN
+                )
 
-        # If rejected, update approval request status
-        if not response.is_approved:
-            approval_request.status = 'rejected'
-            approval_request.responded_by = user
-            approval_request.responded_at = timezone.now()
-            approval_request.response_comment = response.comment
-            approval_request.save()
+            # Create response; the (approval_request, user) unique constraint
+            # rejects a second response without a separate lookup
+            try:
+                with transaction.atomic():
+                    response = ApprovalResponse.objects.create(
+                        approval_request=approval_request,
+                        user=user,
+                        is_approved=serializer.validated_data['is_approved'],
+                        comment=serializer.validated_data.get('comment', '')
+                    )
+            except IntegrityError:
+                return Response(
+                    {'error': 'You have already responded to this request'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+            # If rejected, update approval request status
+            if not response.is_approved:
+                approval_request.status = 'rejected'
+                approval_request.responded_by = user
+                approval_request.responded_at = timezone.now()
+                approval_request.response_comment = response.comment
+                approval_request.save(update_fields=[
+                    'status', 'responded_by', 'responded_at',
+                    'response_comment', 'updated_at'
+                ])
 
         return Response(ApprovalResponseSerializer(response).data)
 
@@ -319,9 +552,7 @@ class WorkflowNotificationViewSet(viewsets.ReadOnlyModelViewSet):
     """
     API endpoint for viewing workflow notifications.
     """
-    queryset = WorkflowNotification.objects.select_related(
-        'user', 'workflow_instance', 'approval_request'
-    ).all()
+    queryset = WorkflowNotification.objects.all()
     serializer_class = WorkflowNotificationSerializer
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
@@ -329,8 +560,15 @@ class WorkflowNotificationViewSet(viewsets.ReadOnlyModelViewSet):
     filterset_fields = ['notification_type', 'is_read']
 
     def get_queryset(self):
-        """Filter to only show current user's notifications."""
-        return self.queryset.filter(user=self.request.user)
+        """
+        Filter to only show current user's notifications.
+
+        The serializer renders related objects as primary keys, so no joins
+        are needed.
+        """
+        return WorkflowNotification.objects.filter(
+            user_id=self.request.user.id
+        ).order_by('-created_at')
 
     @action(detail=False, methods=['get'])
     def unread(self, request):
@@ -342,8 +580,11 @@ class WorkflowNotificationViewSet(viewsets.ReadOnlyModelViewSet):
     @action(detail=False, methods=['get'])
     def unread_count(self, request):
         """Get count of unread notifications."""
-        count = self.get_queryset().filter(is_read=False).count()
-        return Response({'count': count})
+        # Fixed-shape payload polled by every client; skip renderer negotiation
+        return JsonResponse({
+            'count': WorkflowNotificationCounter.get_unread(request.user.pk),
+            'by_type': get_unread_summary(request.user)
+        })
 
     @action(detail=True, methods=['post'])
     def mark_read(self, request, pk=None):
@@ -356,9 +597,35 @@ class WorkflowNotificationViewSet(viewsets.ReadOnlyModelViewSet):
     @action(detail=False, methods=['post'])
     def mark_all_read(self, request):
         """Mark all notifications as read."""
-        mark_all_notifications_read(request.user)
-        return Response({'success': True})
+        updated = mark_all_notifications_read(request.user)
+        return JsonResponse({'success': True, 'count': updated})
+
+
+class WorkflowDashboardView(APIView):
+    """
+    Workflow Dashboard - Pending approvals and unread notifications in one call.
+    """
+    permission_classes = [IsAuthenticated]
 
+    # Most recent unread notifications shown; unread_count carries the total
+    UNREAD_LIMIT = 20
+
+    def get(self, request):
+        user = request.user
 
-# Import models for queryset filters
-from django.db import models
+        # Same joins as ApprovalRequestViewSet; workflow_instance_info reads
+        # the instance's workflow and current state for every row
+        pending = get_pending_approvals(user).select_related(
+            'workflow_instance__workflow', 'workflow_instance__current_state',
+            'transition', 'requested_by', 'responded_by'
+        ).prefetch_related('responses', 'required_approvers', 'required_groups')
+
+        # The serializer renders related objects as primary keys; no joins
+        unread = get_user_notifications(user, unread_only=True)[:self.UNREAD_LIMIT]
+
+        context = {'request': request}
+        return Response({
+            'pending': ApprovalRequestSerializer(pending, many=True, context=context).data,
+            'unread': WorkflowNotificationSerializer(unread, many=True, context=context).data,
+            'unread_count': WorkflowNotificationCounter.get_unread(user.pk)
+        })
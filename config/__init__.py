@@ -1 +1,6 @@
 # EOS Platform Configuration
+
+# Load the Celery app with Django so shared_task calls use the configured broker
+from .celery import app as celery_app
+
+__all__ = ('celery_app',)
@@ -5,8 +5,24 @@ from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
+from django.views.decorators.cache import cache_control
+from django.views.static import serve
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView, SpectacularRedocView
 
+# OpenAPI schema generated at build time (see Dockerfile); served as a static
+# file when present, otherwise generated per request by drf-spectacular.
+SCHEMA_FILE = 'schema.json'
+
+if (settings.STATIC_ROOT / SCHEMA_FILE).exists():
+    schema_path = path(
+        'api/schema/',
+        cache_control(public=True, max_age=3600, immutable=True)(serve),
+        {'path': SCHEMA_FILE, 'document_root': settings.STATIC_ROOT},
+        name='schema'
+    )
+else:
+    schema_path = path('api/schema/', SpectacularAPIView.as_view(), name='schema')
+
 urlpatterns = [
     # Admin
     path('admin/', admin.site.urls),
@@ -21,7 +37,7 @@ urlpatterns = [
     path('api/v1/portal/', include('apps.portal.urls')),
 
     # API Documentation
-    path('api/schema/', SpectacularAPIView.as_view(), name='schema'),
+    schema_path,
     path('api/docs/', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui'),
     path('api/redoc/', SpectacularRedocView.as_view(url_name='schema'), name='redoc'),
 ]